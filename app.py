@@ -5,10 +5,14 @@ os.environ['USE_TORCH'] = '1'
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
 import time
 from transformers import pipeline as hf_pipeline
 
+import dashboard
+import report_export
+import storage
+from records import EmotionRecords
+
 # Set page config with dark theme
 st.set_page_config(
     page_title="360° AI Business Insight Engine",
@@ -226,16 +230,16 @@ def load_models():
         return None, None
 
 def create_audio_insights():
+    # Demo go_emotions output, one result per transcript sentence
+    emotions = EmotionRecords.from_pipeline_output([
+        [{'label': 'optimism', 'score': 0.62}, {'label': 'excitement', 'score': 0.41}, {'label': 'approval', 'score': 0.30}, {'label': 'neutral', 'score': 0.08}],
+        [{'label': 'nervousness', 'score': 0.55}, {'label': 'optimism', 'score': 0.12}, {'label': 'approval', 'score': 0.20}, {'label': 'neutral', 'score': 0.22}],
+        [{'label': 'optimism', 'score': 0.61}, {'label': 'approval', 'score': 0.40}, {'label': 'excitement', 'score': 0.19}, {'label': 'neutral', 'score': 0.15}]
+    ])
     return {
         "transcript": "Team discussed Q3 results showing 15% growth in AI products. Concerns raised about supply chain delays affecting delivery timelines. Marketing team proposed new campaign for product launch.",
-        "emotions": pd.DataFrame([
-            {'label': 'determination', 'score': 0.45},
-            {'label': 'optimism', 'score': 0.30},
-            {'label': 'concern', 'score': 0.25},
-            {'label': 'excitement', 'score': 0.20},
-            {'label': 'neutral', 'score': 0.15}
-        ]),
-        "primary_emotion": "determination",
+        "emotions": emotions.top_emotions(k=5),
+        "primary_emotion": emotions.primary_emotion(),
         "speakers": [
             {"name": "Sarah (CEO)", "time": "32%"},
             {"name": "John (Marketing)", "time": "28%"},
@@ -282,10 +286,36 @@ def create_pdf_insights():
         ]
     }
 
+def create_health_kpis():
+    return [
+        {"name": "Revenue Growth", "value": "+15%", "delta": "▲ 2% from last quarter", "color": "#00c853"},
+        {"name": "Customer Satisfaction", "value": "92%", "delta": "▲ 5% from last quarter", "color": "#00c853"},
+        {"name": "Operational Efficiency", "value": "78%", "delta": "▼ 3% from target", "color": "#ffab00"},
+        {"name": "Risk Level", "value": "Medium", "delta": "Supply chain delays", "color": None}
+    ]
+
+def collect_documents(audio_file, text_input, pdf_file):
+    documents = {
+        "audio": ("demo_meeting_audio", None),
+        "text": ("demo_text_data", None),
+        "pdf": ("demo_report", None)
+    }
+    if audio_file is not None:
+        documents["audio"] = (audio_file.name, audio_file.getvalue())
+    if text_input:
+        documents["text"] = ("pasted_text", text_input.encode("utf-8"))
+    if pdf_file is not None:
+        documents["pdf"] = (pdf_file.name, pdf_file.getvalue())
+    return documents
+
 # Initialize session state
 if "models" not in st.session_state:
     st.session_state.models = load_models()
 
+# SQLite transactions belong to a connection, so each session gets its own
+if "workspace_db" not in st.session_state:
+    st.session_state.workspace_db = storage.connect()
+
 # Hero section
 st.markdown("""
 <div style="padding: 3rem 0 2rem 0;">
@@ -316,6 +346,7 @@ with st.sidebar:
     
     st.markdown("---")
     st.header("Data Input")
+    team = st.text_input("👥 Team Workspace", value="default").strip() or "default"
     
     input_tab, demo_tab = st.tabs(["Upload Data", "Demo Data"])
     
@@ -342,7 +373,10 @@ with st.sidebar:
     """, unsafe_allow_html=True)
 
 # Main content
-if hasattr(st.session_state, 'process_data') and st.session_state.process_data:
+workspace_db = st.session_state.workspace_db
+results = None
+
+if st.session_state.get("process_data"):
     # Simulate processing
     with st.spinner("Analyzing business data with AI..."):
         progress_bar = st.progress(0)
@@ -350,50 +384,46 @@ if hasattr(st.session_state, 'process_data') and st.session_state.process_data:
             time.sleep(0.02)
             progress_bar.progress(i + 1)
     
-    st.success("Analysis Complete! Here's your business intelligence dashboard")
-    
     # Create results
     results = {
         "audio": create_audio_insights(),
         "text": create_text_insights(),
         "pdf": create_pdf_insights()
     }
+    health_kpis = create_health_kpis()
+    storage.save_workspace(
+        workspace_db,
+        team,
+        collect_documents(audio_file, text_input, pdf_file),
+        results,
+        health_kpis
+    )
+    st.session_state.process_data = False
     
+    st.success("Analysis Complete! Here's your business intelligence dashboard")
+else:
+    # Reopen the team's workspace from precomputed results
+    workspace = storage.load_workspace(workspace_db, team)
+    results = None if workspace is None else workspace[0]
+    if results is not None and len(results) == 3:
+        health_kpis = workspace[1] or create_health_kpis()
+        st.info(f"Showing saved insights for the '{team}' workspace. Generate insights again to refresh them.")
+    else:
+        results = None
+
+if results is not None:
     # KPI Section
     st.subheader("Business Health Dashboard")
-    kpi1, kpi2, kpi3, kpi4 = st.columns(4)
-    
-    kpi1.markdown("""
-    <div class="kpi-card">
-        <div>Revenue Growth</div>
-        <div class="kpi-value">+15%</div>
-        <div style="color: #00c853;">▲ 2% from last quarter</div>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    kpi2.markdown("""
-    <div class="kpi-card">
-        <div>Customer Satisfaction</div>
-        <div class="kpi-value">92%</div>
-        <div style="color: #00c853;">▲ 5% from last quarter</div>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    kpi3.markdown("""
-    <div class="kpi-card">
-        <div>Operational Efficiency</div>
-        <div class="kpi-value">78%</div>
-        <div style="color: #ffab00;">▼ 3% from target</div>
-    </div>
-    """, unsafe_allow_html=True)
     
-    kpi4.markdown("""
-    <div class="kpi-card">
-        <div>Risk Level</div>
-        <div class="kpi-value">Medium</div>
-        <div>Supply chain delays</div>
-    </div>
-    """, unsafe_allow_html=True)
+    for column, kpi in zip(st.columns(len(health_kpis)), health_kpis):
+        delta_style = f' style="color: {kpi["color"]};"' if kpi["color"] else ""
+        column.markdown(f"""
+        <div class="kpi-card">
+            <div>{kpi['name']}</div>
+            <div class="kpi-value">{kpi['value']}</div>
+            <div{delta_style}>{kpi['delta']}</div>
+        </div>
+        """, unsafe_allow_html=True)
     
     # Insights in columns
     col1, col2 = st.columns(2)
@@ -440,17 +470,7 @@ if hasattr(st.session_state, 'process_data') and st.session_state.process_data:
             """, unsafe_allow_html=True)
             
             # Speaker distribution chart
-            speaker_df = pd.DataFrame(results["audio"]["speakers"])
-            fig = px.pie(
-                speaker_df,
-                names="name",
-                values="time",
-                hole=0.5,
-                color_discrete_sequence=px.colors.sequential.Viridis,
-            )
-            fig.update_layout(showlegend=False, margin=dict(t=0, b=0, l=0, r=0))
-            fig.update_traces(textposition='inside', textinfo='percent+label')
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(dashboard.speaker_chart(results["audio"]), use_container_width=True)
             
         
         # Text Insights Card
@@ -484,23 +504,7 @@ if hasattr(st.session_state, 'process_data') and st.session_state.process_data:
             """, unsafe_allow_html=True)
             
             # Topic importance chart
-            fig = px.bar(
-                results["text"]["topics"],
-                x="importance",
-                y="topic",
-                orientation='h',
-                color="importance",
-                color_continuous_scale='Viridis',
-                labels={'importance': 'Importance Score', 'topic': ''}
-            )
-            fig.update_layout(
-                yaxis=dict(autorange="reversed"), 
-                xaxis=dict(showgrid=False),
-                coloraxis_showscale=False,
-                margin=dict(t=0, b=0, l=0, r=0),
-                height=300
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(dashboard.topic_chart(results["text"]), use_container_width=True)
             
             st.markdown("</div></div>", unsafe_allow_html=True) 
     
@@ -524,23 +528,7 @@ if hasattr(st.session_state, 'process_data') and st.session_state.process_data:
             """, unsafe_allow_html=True)
             
             # Financial trends chart
-            fig = px.line(
-                results["pdf"]["chart_data"],
-                x="Month",
-                y=["Revenue", "Profit"],
-                color_discrete_map={"Revenue": "#7b68ee", "Profit": "#5e43f3"},
-                markers=True,
-                line_shape="spline"
-            )
-            fig.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                legend_title_text='',
-                yaxis_title="Amount ($M)",
-                margin=dict(t=30, b=0, l=0, r=0),
-                height=300
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(dashboard.financial_chart(results["pdf"]), use_container_width=True)
             
             st.markdown("""
             <pre>
@@ -569,23 +557,7 @@ if hasattr(st.session_state, 'process_data') and st.session_state.process_data:
             """, unsafe_allow_html=True)
             
             # Emotion distribution chart
-            fig = px.bar(
-                results["audio"]["emotions"],
-                x="score",
-                y="label",
-                orientation='h',
-                color="score",
-                color_continuous_scale='Viridis',
-                labels={'score': 'Confidence', 'label': ''}
-            )
-            fig.update_layout(
-                yaxis=dict(autorange="reversed"), 
-                xaxis=dict(showgrid=False),
-                coloraxis_showscale=False,
-                margin=dict(t=0, b=0, l=0, r=0),
-                height=300
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(dashboard.emotion_chart(results["audio"]), use_container_width=True)
             
             st.markdown("</div></div>", unsafe_allow_html=True)  # Close card
         
@@ -616,15 +588,14 @@ if hasattr(st.session_state, 'process_data') and st.session_state.process_data:
             st.markdown("</div></div>", unsafe_allow_html=True)  # Close card
     
     # Business Alert
-    st.markdown("""
+    st.markdown(f"""
     <div class="alert-box">
         <div style="display: flex; align-items: center; gap: 20px;">
             <div style="font-size: 32px;">⚠️</div>
             <div>
-                <h3 style="margin: 0 0 10px 0;">Business Alert: Supply Chain Risk</h3>
+                <h3 style="margin: 0 0 10px 0;">{dashboard.BUSINESS_ALERT["title"]}</h3>
                 <p style="margin: 0;">
-                    Our analysis detected significant supply chain delays that may impact Q4 delivery timelines. 
-                    We recommend immediate action to mitigate potential revenue impact.
+                    {dashboard.BUSINESS_ALERT["message"]}
                 </p>
             </div>
         </div>
@@ -633,52 +604,28 @@ if hasattr(st.session_state, 'process_data') and st.session_state.process_data:
     
     # Recommendations
     st.subheader("Strategic Recommendations")
-    rec1, rec2, rec3 = st.columns(3)
     
-    rec1.markdown("""
-    <div class="custom-card">
-        <div class="card-header">
-            <div class="card-icon">🔁</div>
-            <h3 style="margin: 0;">Optimize Supply Chain</h3>
-        </div>
-        <ul>
-            <li>Diversify supplier base</li>
-            <li>Implement predictive analytics</li>
-            <li>Increase inventory buffers</li>
-            <li>Renegotiate contracts</li>
-        </ul>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    rec2.markdown("""
-    <div class="custom-card">
-        <div class="card-header">
-            <div class="card-icon">🚀</div>
-            <h3 style="margin: 0;">Accelerate Growth</h3>
+    rec_columns = st.columns(len(dashboard.STRATEGIC_RECOMMENDATIONS))
+    for column, rec in zip(rec_columns, dashboard.STRATEGIC_RECOMMENDATIONS):
+        actions = "".join(f"<li>{action}</li>" for action in rec["actions"])
+        column.markdown(f"""
+        <div class="custom-card">
+            <div class="card-header">
+                <div class="card-icon">{rec['icon']}</div>
+                <h3 style="margin: 0;">{rec['title']}</h3>
+            </div>
+            <ul>{actions}</ul>
         </div>
-        <ul>
-            <li>Increase AI R&D investment</li>
-            <li>Expand to new markets</li>
-            <li>Launch referral program</li>
-            <li>Enhance partnerships</li>
-        </ul>
-    </div>
-    """, unsafe_allow_html=True)
+        """, unsafe_allow_html=True)
     
-    rec3.markdown("""
-    <div class="custom-card">
-        <div class="card-header">
-            <div class="card-icon">🛡️</div>
-            <h3 style="margin: 0;">Mitigate Risks</h3>
-        </div>
-        <ul>
-            <li>Develop contingency plans</li>
-            <li>Strengthen cybersecurity</li>
-            <li>Monitor competitive landscape</li>
-            <li>Stress test financials</li>
-        </ul>
-    </div>
-    """, unsafe_allow_html=True)
+    # Report export from the results already on screen
+    st.download_button(
+        "📥 Download Report (HTML)",
+        data=report_export.render_html(team, results, health_kpis),
+        file_name=f"{report_export.team_slug(team)}_insight_report.html",
+        mime="text/html",
+        use_container_width=True
+    )
 
 else:
     # How it works section
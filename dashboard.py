@@ -0,0 +1,125 @@
+"""Dashboard content shared by the Streamlit app and the report export.
+
+Nothing in here imports Streamlit, so charts and recommendations can be
+rebuilt from stored results without running the app.
+"""
+import pandas as pd
+import plotly.express as px
+
+BUSINESS_ALERT = {
+    "title": "Business Alert: Supply Chain Risk",
+    "message": "Our analysis detected significant supply chain delays that may impact Q4 delivery timelines. "
+               "We recommend immediate action to mitigate potential revenue impact."
+}
+
+STRATEGIC_RECOMMENDATIONS = [
+    {
+        "icon": "🔁",
+        "title": "Optimize Supply Chain",
+        "actions": ["Diversify supplier base", "Implement predictive analytics", "Increase inventory buffers", "Renegotiate contracts"]
+    },
+    {
+        "icon": "🚀",
+        "title": "Accelerate Growth",
+        "actions": ["Increase AI R&D investment", "Expand to new markets", "Launch referral program", "Enhance partnerships"]
+    },
+    {
+        "icon": "🛡️",
+        "title": "Mitigate Risks",
+        "actions": ["Develop contingency plans", "Strengthen cybersecurity", "Monitor competitive landscape", "Stress test financials"]
+    }
+]
+
+def speaker_chart(audio):
+    fig = px.pie(
+        pd.DataFrame(audio["speakers"]),
+        names="name",
+        values="time",
+        hole=0.5,
+        color_discrete_sequence=px.colors.sequential.Viridis,
+    )
+    fig.update_layout(showlegend=False, margin=dict(t=0, b=0, l=0, r=0))
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    return fig
+
+def topic_chart(text):
+    fig = px.bar(
+        text["topics"],
+        x="importance",
+        y="topic",
+        orientation='h',
+        color="importance",
+        color_continuous_scale='Viridis',
+        labels={'importance': 'Importance Score', 'topic': ''}
+    )
+    fig.update_layout(
+        yaxis=dict(autorange="reversed"),
+        xaxis=dict(showgrid=False),
+        coloraxis_showscale=False,
+        margin=dict(t=0, b=0, l=0, r=0),
+        height=300
+    )
+    return fig
+
+def financial_chart(pdf):
+    fig = px.line(
+        pdf["chart_data"],
+        x="Month",
+        y=["Revenue", "Profit"],
+        color_discrete_map={"Revenue": "#7b68ee", "Profit": "#5e43f3"},
+        markers=True,
+        line_shape="spline"
+    )
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        legend_title_text='',
+        yaxis_title="Amount ($M)",
+        margin=dict(t=30, b=0, l=0, r=0),
+        height=300
+    )
+    return fig
+
+def emotion_chart(audio):
+    fig = px.bar(
+        audio["emotions"],
+        x="score",
+        y="label",
+        orientation='h',
+        color="score",
+        color_continuous_scale='Viridis',
+        labels={'score': 'Confidence', 'label': ''}
+    )
+    fig.update_layout(
+        yaxis=dict(autorange="reversed"),
+        xaxis=dict(showgrid=False),
+        coloraxis_showscale=False,
+        margin=dict(t=0, b=0, l=0, r=0),
+        height=300
+    )
+    return fig
+
+def build_charts(results):
+    """All dashboard figures keyed by their section title."""
+    return {
+        "Speaker Distribution": speaker_chart(results["audio"]),
+        "Topic Importance": topic_chart(results["text"]),
+        "Revenue & Profit Trends": financial_chart(results["pdf"]),
+        "Emotion Distribution": emotion_chart(results["audio"])
+    }
+
+def build_frames(results, health_kpis):
+    """The DataFrames behind the dashboard, keyed by export file name."""
+    return {
+        "health_kpis": pd.DataFrame(health_kpis),
+        "speakers": pd.DataFrame(results["audio"]["speakers"]),
+        "emotions": results["audio"]["emotions"],
+        "topics": results["text"]["topics"],
+        "key_phrases": pd.DataFrame({"phrase": results["text"]["key_phrases"]}),
+        "financials": results["pdf"]["chart_data"],
+        "financial_kpis": pd.DataFrame(results["pdf"]["kpis"]),
+        "recommendations": pd.DataFrame(
+            [(rec["title"], action) for rec in STRATEGIC_RECOMMENDATIONS for action in rec["actions"]],
+            columns=["recommendation", "action"]
+        )
+    }
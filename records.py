@@ -0,0 +1,172 @@
+"""Compact in-memory representation of per-message insight records.
+
+Emotion scores live in a single float16/float32 matrix (one row per message,
+one column per go_emotions label) instead of one dict per message, labels are
+kept as integer codes, and per-message metadata uses ``__slots__`` objects.
+The metadata fields used for filtering (team, source, speaker) are also kept
+as categorical code arrays next to the matrix, so filtering and aggregation
+are both vectorized.
+"""
+import numpy as np
+import pandas as pd
+
+GO_EMOTIONS_LABELS = (
+    "admiration", "amusement", "anger", "annoyance", "approval", "caring",
+    "confusion", "curiosity", "desire", "disappointment", "disapproval",
+    "disgust", "embarrassment", "excitement", "fear", "gratitude", "grief",
+    "joy", "love", "nervousness", "optimism", "pride", "realization",
+    "relief", "remorse", "sadness", "surprise", "neutral",
+)
+
+# Metadata fields stored as categorical code arrays for vectorized filtering
+FILTER_FIELDS = ("team", "source", "speaker")
+
+
+class MessageMeta:
+    """Lightweight metadata for one analysed message."""
+
+    __slots__ = ("message_id", "team", "source", "speaker", "timestamp")
+
+    def __init__(self, message_id, team=None, source=None, speaker=None, timestamp=None):
+        self.message_id = message_id
+        self.team = team
+        self.source = source
+        self.speaker = speaker
+        self.timestamp = timestamp
+
+    def __repr__(self):
+        return f"MessageMeta(message_id={self.message_id!r}, source={self.source!r}, speaker={self.speaker!r})"
+
+
+class EmotionRecords:
+    """Score matrix for a corpus of messages, indexed by message id."""
+
+    __slots__ = ("labels", "message_ids", "scores", "meta", "fields", "_positions")
+
+    def __init__(self, message_ids, scores, labels=GO_EMOTIONS_LABELS, meta=None, fields=None):
+        """``fields`` maps names in :data:`FILTER_FIELDS` to one value per row;
+        when omitted they are taken from ``meta``."""
+        scores = np.asarray(scores)
+        if scores.dtype not in (np.float16, np.float32):
+            scores = scores.astype(np.float32)
+        if scores.ndim != 2 or scores.shape[1] != len(labels):
+            raise ValueError(f"scores must have shape (n_messages, {len(labels)}), got {scores.shape}")
+        if len(message_ids) != scores.shape[0]:
+            raise ValueError("message_ids and scores must have the same number of rows")
+        if meta is not None and len(meta) != scores.shape[0]:
+            raise ValueError("meta and scores must have the same number of rows")
+        if fields is None and meta is not None:
+            fields = {field: [getattr(item, field) for item in meta] for field in FILTER_FIELDS}
+
+        self.fields = {}
+        for field, values in (fields or {}).items():
+            if field not in FILTER_FIELDS:
+                raise ValueError(f"unknown metadata field {field!r}")
+            if len(values) != scores.shape[0]:
+                raise ValueError(f"{field} and scores must have the same number of rows")
+            self.fields[field] = pd.Categorical(values)
+
+        self.labels = tuple(labels)
+        self.message_ids = np.asarray(message_ids, dtype=np.int64)
+        self.scores = scores
+        self.meta = meta
+        self._positions = None
+
+    @classmethod
+    def empty(cls, n_messages, labels=GO_EMOTIONS_LABELS, dtype=np.float16):
+        return cls(np.arange(n_messages), np.zeros((n_messages, len(labels)), dtype=dtype), labels)
+
+    @classmethod
+    def from_pipeline_output(cls, outputs, message_ids=None, labels=GO_EMOTIONS_LABELS, dtype=np.float16):
+        """Build records from ``text-classification`` output with ``top_k=None``."""
+        if message_ids is None:
+            message_ids = np.arange(len(outputs))
+        records = cls(message_ids, np.zeros((len(outputs), len(labels)), dtype=dtype), labels)
+        records.fill(0, outputs)
+        return records
+
+    def fill(self, start, outputs):
+        """Write a batch of pipeline results into rows ``start:start + len(outputs)``."""
+        columns = {label: i for i, label in enumerate(self.labels)}
+        block = np.zeros((len(outputs), len(self.labels)), dtype=np.float32)
+        for row, scored in enumerate(outputs):
+            for item in scored:
+                column = columns.get(item["label"])
+                if column is None:
+                    raise ValueError(f"unknown label {item['label']!r}")
+                block[row, column] = item["score"]
+        self.scores[start:start + len(outputs)] = block
+
+    def __len__(self):
+        return self.scores.shape[0]
+
+    @property
+    def nbytes(self):
+        return (self.scores.nbytes + self.message_ids.nbytes
+                + sum(values.codes.nbytes for values in self.fields.values()))
+
+    def row(self, message_id):
+        """Return the score vector for ``message_id``."""
+        if self._positions is None:
+            self._positions = pd.Index(self.message_ids)
+        return self.scores[self._positions.get_loc(message_id)]
+
+    def mask(self, **criteria):
+        """Boolean row mask for messages whose metadata matches ``criteria``, e.g. ``mask(source="text")``."""
+        result = np.ones(len(self), dtype=bool)
+        for field, value in criteria.items():
+            if field not in self.fields:
+                raise ValueError(f"records have no {field!r} metadata to filter on")
+            values = self.fields[field]
+            # Missing values have code -1, which is also what get_indexer returns for unknown values
+            code = -1 if value is None else values.categories.get_indexer([value])[0]
+            if code == -1 and value is not None:
+                return np.zeros(len(self), dtype=bool)
+            result &= values.codes == code
+        return result
+
+    def dominant_codes(self):
+        """Integer code of the highest scoring label for every message."""
+        return self.scores.argmax(axis=1).astype(np.min_scalar_type(len(self.labels)))
+
+    def dominant_labels(self):
+        return pd.Categorical.from_codes(self.dominant_codes(), categories=self.labels)
+
+    def mean_scores(self, mask=None):
+        """Mean score per label, accumulated in float32."""
+        scores = self.scores if mask is None else self.scores[mask]
+        if len(scores) == 0:
+            return np.zeros(len(self.labels), dtype=np.float32)
+        return scores.mean(axis=0, dtype=np.float32)
+
+    def label_counts(self):
+        """Number of messages whose dominant emotion is each label."""
+        counts = np.bincount(self.dominant_codes(), minlength=len(self.labels))
+        return pd.Series(counts, index=list(self.labels), name="count")
+
+    def top_emotions(self, k=5, mask=None):
+        """Top ``k`` labels by mean score, in the ``label``/``score`` layout the dashboard charts use."""
+        means = self.mean_scores(mask)
+        order = np.argsort(means)[::-1][:k]
+        return pd.DataFrame({
+            "label": [self.labels[i] for i in order],
+            "score": means[order].astype(float),
+        })
+
+    def primary_emotion(self, mask=None):
+        return self.labels[int(self.mean_scores(mask).argmax())]
+
+
+def score_messages(classifier, texts, message_ids=None, batch_size=64, dtype=np.float16):
+    """Run the go_emotions ``classifier`` over ``texts`` straight into an :class:`EmotionRecords`.
+
+    Results are written into the matrix batch by batch, so the per-message
+    dicts returned by the pipeline never accumulate for the whole corpus.
+    """
+    if message_ids is None:
+        message_ids = np.arange(len(texts))
+    records = EmotionRecords(message_ids, np.zeros((len(texts), len(GO_EMOTIONS_LABELS)), dtype=dtype))
+    for start in range(0, len(texts), batch_size):
+        batch = list(texts[start:start + batch_size])
+        records.fill(start, classifier(batch, batch_size=batch_size, truncation=True))
+    return records
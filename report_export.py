@@ -0,0 +1,229 @@
+"""Export team insight reports straight from the workspace database.
+
+Each report is a static HTML page (Business Health Dashboard, charts as
+embedded Plotly JSON, business alert and Strategic Recommendations) plus
+CSV/Parquet copies of the underlying DataFrames. Reports are built from the
+stored results only, so neither the Streamlit UI nor the models are involved
+and many teams can be exported in parallel::
+
+    python report_export.py --out reports            # every team
+    python report_export.py --out reports --team sales --team ops
+    python report_export.py --out reports --offline  # embed plotly.js
+
+By default the pages load plotly.js from a CDN, so charts need an internet
+connection; ``--offline`` embeds the library (several MB per report).
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import dashboard
+import storage
+
+
+DATA_FORMATS = ("csv", "parquet")
+
+REPORT_CSS = """
+body { background: #121212; color: #e0e0e0; font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 0 auto; max-width: 1200px; padding: 24px; }
+h1, h2, h3 { color: white; }
+.kpi-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(220px, 1fr)); gap: 16px; }
+.kpi-card { background: linear-gradient(135deg, #2c2c54 0%, #1a1a2e 100%); border-radius: 16px; padding: 20px; text-align: center; border: 1px solid #40407a; }
+.kpi-value { font-size: 32px; font-weight: 700; margin: 10px 0; color: #a78bfa; }
+.chart-grid { display: grid; grid-template-columns: 1fr 1fr; gap: 20px; }
+.custom-card { background: #1e1e1e; border-radius: 16px; padding: 20px; border: 1px solid #333333; }
+.custom-card li { margin-bottom: 8px; color: #b0b0b0; }
+.alert-box { background: linear-gradient(135deg, #2d3436 0%, #1e2729 100%); border-left: 5px solid #ffab00; border-radius: 12px; padding: 20px; margin: 20px 0; }
+.footer { text-align: center; padding: 20px; margin-top: 40px; color: #b0b0b0; font-size: 14px; border-top: 1px solid #333; }
+"""
+
+def _check_formats(formats):
+    unknown = sorted(set(formats) - set(DATA_FORMATS))
+    if unknown:
+        raise ValueError(f"Unknown data formats {unknown}; choose from {', '.join(DATA_FORMATS)}")
+    return tuple(formats)
+
+def _parse_formats(value):
+    try:
+        return _check_formats(fmt.strip() for fmt in value.split(",") if fmt.strip())
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def team_slug(team):
+    """Filesystem-safe name for ``team``; the hash keeps e.g. "sales team" and "sales/team" apart."""
+    readable = re.sub(r"[^\w.-]+", "_", team).strip("._") or "team"
+    digest = hashlib.sha1(team.encode("utf-8")).hexdigest()[:8]
+    return f"{readable}-{digest}"
+
+def _plotly_js_tag(offline):
+    # Match the plotly.js bundled with the installed plotly.py, which produced the figure JSON
+    from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+    if offline:
+        return f"<script>{get_plotlyjs()}</script>"
+    return f'<script src="https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js" charset="utf-8"></script>'
+
+def render_html(team, results, health_kpis, generated_at=None, offline=False):
+    """Render an HTML report from stored results.
+
+    Charts load plotly.js from a CDN unless ``offline`` is set, in which case
+    the library is embedded and the page works without a network connection.
+    """
+    kpi_cards = []
+    for kpi in health_kpis:
+        delta_style = f' style="color: {kpi["color"]};"' if kpi.get("color") else ""
+        kpi_cards.append(f"""
+        <div class="kpi-card">
+            <div>{html.escape(kpi['name'])}</div>
+            <div class="kpi-value">{html.escape(kpi['value'])}</div>
+            <div{delta_style}>{html.escape(kpi['delta'])}</div>
+        </div>""")
+
+    chart_cards = []
+    chart_scripts = []
+    for i, (title, fig) in enumerate(dashboard.build_charts(results).items()):
+        fig.update_layout(template="plotly_dark")
+        chart_cards.append(f"""
+        <div class="custom-card">
+            <h3>{html.escape(title)}</h3>
+            <div id="chart-{i}"></div>
+        </div>""")
+        # Escape "</" so chart text can never close the script element early
+        chart_json = fig.to_json().replace("</", "<\\/")
+        chart_scripts.append(f"""
+    <script type="application/json" id="chart-{i}-data">{chart_json}</script>""")
+
+    recommendations = []
+    for rec in dashboard.STRATEGIC_RECOMMENDATIONS:
+        actions = "".join(f"<li>{html.escape(action)}</li>" for action in rec["actions"])
+        recommendations.append(f"""
+        <div class="custom-card">
+            <h3>{rec['icon']} {html.escape(rec['title'])}</h3>
+            <ul>{actions}</ul>
+        </div>""")
+
+    alert = dashboard.BUSINESS_ALERT
+    generated = f" | Generated {html.escape(generated_at)}" if generated_at else ""
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="utf-8">
+    <title>{html.escape(team)} - Business Insight Report</title>
+    {_plotly_js_tag(offline)}
+    <style>{REPORT_CSS}</style>
+</head>
+<body>
+    <h1>360° AI Business Insight Report: {html.escape(team)}</h1>
+
+    <h2>Business Health Dashboard</h2>
+    <div class="kpi-grid">{"".join(kpi_cards)}
+    </div>
+
+    <h2>Insights</h2>
+    <div class="chart-grid">{"".join(chart_cards)}
+    </div>
+
+    <div class="alert-box">
+        <h3 style="margin: 0 0 10px 0;">⚠️ {html.escape(alert['title'])}</h3>
+        <p style="margin: 0;">{html.escape(alert['message'])}</p>
+    </div>
+
+    <h2>Strategic Recommendations</h2>
+    <div class="kpi-grid">{"".join(recommendations)}
+    </div>
+
+    <div class="footer">360° AI Business Insight Engine{generated}</div>
+{"".join(chart_scripts)}
+    <script>
+        document.querySelectorAll('script[id$="-data"]').forEach(function (node) {{
+            var fig = JSON.parse(node.textContent);
+            Plotly.newPlot(node.id.replace(/-data$/, ''), fig.data, fig.layout, {{responsive: true}});
+        }});
+    </script>
+</body>
+</html>
+"""
+
+def export_team_report(team, out_dir, db_path=storage.DEFAULT_DB_PATH, formats=("csv", "parquet"), offline=False):
+    """Write ``report.html`` and the dashboard DataFrames for ``team`` under ``out_dir``.
+
+    Returns the report directory, or ``None`` if the team has no stored results.
+    Parquet output needs pyarrow or fastparquet and is skipped without them.
+    """
+    formats = _check_formats(formats)
+    conn = storage.connect(db_path)
+    try:
+        workspace = storage.load_workspace(conn, team)
+    finally:
+        conn.close()
+    if workspace is None or len(workspace[0]) < 3:
+        return None
+    results, health_kpis, generated_at = workspace
+
+    report_dir = os.path.join(out_dir, team_slug(team))
+    os.makedirs(report_dir, exist_ok=True)
+    written = ["report.html"]
+    with open(os.path.join(report_dir, "report.html"), "w", encoding="utf-8") as f:
+        f.write(render_html(team, results, health_kpis, generated_at, offline))
+
+    write_parquet = "parquet" in formats
+    for name, frame in dashboard.build_frames(results, health_kpis).items():
+        if "csv" in formats:
+            frame.to_csv(os.path.join(report_dir, f"{name}.csv"), index=False)
+            written.append(f"{name}.csv")
+        if write_parquet:
+            try:
+                frame.to_parquet(os.path.join(report_dir, f"{name}.parquet"), index=False)
+                written.append(f"{name}.parquet")
+            except ImportError:
+                write_parquet = False
+
+    with open(os.path.join(report_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"team": team, "generated_at": generated_at, "files": sorted(written)}, f, indent=2)
+    return report_dir
+
+def export_reports(out_dir, teams=None, db_path=storage.DEFAULT_DB_PATH, workers=None, formats=("csv", "parquet"),
+                   offline=False):
+    """Export reports for ``teams`` (default: every stored team) in parallel processes."""
+    formats = _check_formats(formats)
+    if teams is None:
+        conn = storage.connect(db_path)
+        try:
+            teams = storage.list_teams(conn)
+        finally:
+            conn.close()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            team: pool.submit(export_team_report, team, out_dir, db_path, formats, offline)
+            for team in dict.fromkeys(teams)
+        }
+        return {team: future.result() for team, future in futures.items()}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export insight reports from the workspace database.")
+    parser.add_argument("--out", default="reports", help="Output directory")
+    parser.add_argument("--db", default=storage.DEFAULT_DB_PATH, help="Workspace database path")
+    parser.add_argument("--team", action="append", dest="teams", help="Team to export (repeatable, default: all)")
+    parser.add_argument("--workers", type=int, default=None, help="Parallel export processes")
+    parser.add_argument("--formats", type=_parse_formats, default=DATA_FORMATS,
+                        help="Comma separated data formats (csv, parquet)")
+    parser.add_argument("--offline", action="store_true", help="Embed plotly.js so reports render without internet")
+    args = parser.parse_args(argv)
+
+    exported = export_reports(
+        args.out,
+        teams=args.teams,
+        db_path=args.db,
+        workers=args.workers,
+        formats=args.formats,
+        offline=args.offline
+    )
+    for team, path in exported.items():
+        print(f"{team}: {path or 'no stored insights'}")
+
+if __name__ == "__main__":
+    main()
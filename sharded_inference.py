@@ -0,0 +1,309 @@
+"""Process-pool sharded inference for large text corpora.
+
+A single ``hf_pipeline`` on ``device=-1`` shares one PyTorch thread pool and
+stops scaling after a few cores for short-sequence classification. Here the
+corpus is tokenized in chunks straight into a shared memory buffer of token
+ids, and N worker processes - each with its own copy of the model and a
+pinned thread count - score batches of rows and write the results into a
+shared output matrix. Batches are formed from length-sorted rows to keep
+padding low; workers scatter results back by row index, so the output is
+already in input order.
+
+Run the module directly to measure throughput for several worker counts::
+
+    python sharded_inference.py messages.txt --workers 1 8 16 32
+"""
+import argparse
+import multiprocessing as mp
+import os
+import queue
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from records import EmotionRecords
+
+DEFAULT_MODEL = "SamLowe/roberta-base-go_emotions"
+
+# Seconds between worker liveness checks while waiting on results
+POLL_INTERVAL = 1.0
+
+
+def load_model(model_name, threads):
+    """Load the classifier in a worker and return ``predict(token_ids, mask) -> probabilities``."""
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    os.environ["MKL_NUM_THREADS"] = str(threads)
+
+    import torch
+    from transformers import AutoModelForSequenceClassification
+
+    torch.set_num_threads(threads)
+    torch.set_num_interop_threads(1)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    model.eval()
+    multi_label = model.config.problem_type == "multi_label_classification"
+
+    def predict(token_ids, mask):
+        with torch.inference_mode():
+            logits = model(
+                input_ids=torch.from_numpy(token_ids),
+                attention_mask=torch.from_numpy(mask),
+            ).logits
+        probs = torch.sigmoid(logits) if multi_label else torch.softmax(logits, dim=-1)
+        return probs.numpy()
+
+    return predict
+
+
+def _worker(worker_id, model_loader, model_name, threads, pad_token_id, jobs, done):
+    try:
+        predict = model_loader(model_name, threads)
+    except Exception as e:
+        done.put(("error", None, worker_id, f"{type(e).__name__}: {e}"))
+        return
+    done.put(("ready", None, worker_id, None))
+
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+        job_id, ids_name, ids_shape, out_name, out_shape, batches = job
+        # Attach once per job and reuse the mappings for all of its batches
+        ids_shm = shared_memory.SharedMemory(name=ids_name)
+        out_shm = shared_memory.SharedMemory(name=out_name)
+        token_ids = np.ndarray(ids_shape, dtype=np.int32, buffer=ids_shm.buf)
+        scores = np.ndarray(out_shape, dtype=np.float32, buffer=out_shm.buf)
+        try:
+            for rows in batches:
+                try:
+                    batch = token_ids[rows]
+                    mask = batch != pad_token_id
+                    # Rows in a batch have similar lengths, so trim the shared padding
+                    length = max(int(mask.sum(axis=1).max()), 1)
+                    scores[rows] = predict(batch[:, :length].astype(np.int64), mask[:, :length].astype(np.int64))
+                    done.put(("batch", job_id, int(rows[0]), None))
+                except Exception as e:
+                    done.put(("batch", job_id, int(rows[0]), f"{type(e).__name__}: {e}"))
+        finally:
+            # Views must be released before the buffers can be closed
+            del token_ids, scores
+            ids_shm.close()
+            out_shm.close()
+
+
+class ShardedClassifier:
+    """Score texts with ``num_workers`` model replicas running in separate processes.
+
+    Use as a context manager so the worker processes are shut down::
+
+        with ShardedClassifier(num_workers=8) as classifier:
+            records = classifier.score(texts)
+
+    ``tokenizer``, ``labels`` and ``model_loader`` default to the Hugging Face
+    artifacts for ``model_name``; ``model_loader`` must be a picklable
+    top-level function with the signature of :func:`load_model`.
+    """
+
+    def __init__(self, model_name=DEFAULT_MODEL, num_workers=None, threads_per_worker=None,
+                 batch_size=32, max_length=128, tokenize_chunk_size=4096,
+                 tokenizer=None, labels=None, model_loader=load_model):
+        cpus = os.cpu_count() or 1
+        self.model_name = model_name
+        self.num_workers = num_workers or cpus
+        self.threads_per_worker = threads_per_worker or max(cpus // self.num_workers, 1)
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.tokenize_chunk_size = tokenize_chunk_size
+        self.tokenizer = tokenizer
+        self.labels = tuple(labels) if labels is not None else None
+        self.model_loader = model_loader
+        self._processes = []
+        self._jobs = []
+        self._done = None
+        self._job_id = 0
+
+    def start(self):
+        """Start the workers and wait until every one of them has loaded its model."""
+        if self.tokenizer is None or self.labels is None:
+            from transformers import AutoConfig, AutoTokenizer
+
+            if self.tokenizer is None:
+                self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+            if self.labels is None:
+                config = AutoConfig.from_pretrained(self.model_name)
+                self.labels = tuple(config.id2label[i] for i in range(config.num_labels))
+
+        context = mp.get_context("spawn")
+        self._done = context.Queue()
+        self._jobs = [context.Queue() for _ in range(self.num_workers)]
+        self._processes = [
+            context.Process(
+                target=_worker,
+                args=(worker_id, self.model_loader, self.model_name, self.threads_per_worker,
+                      self.tokenizer.pad_token_id, jobs, self._done),
+                daemon=True,
+            )
+            for worker_id, jobs in enumerate(self._jobs)
+        ]
+        for process in self._processes:
+            process.start()
+
+        errors = []
+        try:
+            for _ in self._processes:
+                kind, _, worker_id, error = self._next_message()
+                if kind == "error":
+                    errors.append(f"worker {worker_id}: {error}")
+        except RuntimeError:
+            self._terminate()
+            raise
+        if errors:
+            self._terminate()
+            raise RuntimeError("Failed to load model in workers: " + "; ".join(errors))
+        return self
+
+    def close(self):
+        for jobs in self._jobs:
+            jobs.put(None)
+        for process in self._processes:
+            process.join()
+        self._processes = []
+        self._jobs = []
+
+    def _terminate(self):
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+        self._processes = []
+        self._jobs = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        if self._processes:
+            self.close()
+
+    def _next_message(self):
+        """Wait for a worker message, failing instead of hanging if a worker has died."""
+        while True:
+            try:
+                return self._done.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                dead = [
+                    f"worker {worker_id} (exit code {process.exitcode})"
+                    for worker_id, process in enumerate(self._processes)
+                    if not process.is_alive()
+                ]
+                if dead:
+                    raise RuntimeError("Sharded inference worker died: " + ", ".join(dead))
+
+    def _tokenize_into(self, texts, token_ids):
+        for start in range(0, len(texts), self.tokenize_chunk_size):
+            chunk = list(texts[start:start + self.tokenize_chunk_size])
+            encoded = self.tokenizer(
+                chunk,
+                padding=False,
+                truncation=True,
+                max_length=self.max_length,
+            )["input_ids"]
+            for row, ids in enumerate(encoded, start):
+                token_ids[row, :len(ids)] = ids
+
+    def score(self, texts, message_ids=None, dtype=np.float16):
+        """Score ``texts`` and return an :class:`EmotionRecords` in input order."""
+        if not self._processes:
+            raise RuntimeError("ShardedClassifier is not running; call start() or use it as a context manager")
+        if message_ids is None:
+            message_ids = np.arange(len(texts))
+        if len(texts) == 0:
+            return EmotionRecords(message_ids, np.zeros((0, len(self.labels)), dtype=dtype), self.labels)
+
+        ids_shape = (len(texts), self.max_length)
+        out_shape = (len(texts), len(self.labels))
+        ids_shm = shared_memory.SharedMemory(create=True, size=int(np.prod(ids_shape)) * 4)
+        out_shm = shared_memory.SharedMemory(create=True, size=int(np.prod(out_shape)) * 4)
+        token_ids = scores = None
+        try:
+            token_ids = np.ndarray(ids_shape, dtype=np.int32, buffer=ids_shm.buf)
+            token_ids.fill(self.tokenizer.pad_token_id)
+            self._tokenize_into(texts, token_ids)
+
+            # Batch length-sorted rows so each batch carries as little padding as possible
+            lengths = (token_ids != self.tokenizer.pad_token_id).sum(axis=1)
+            order = np.argsort(lengths, kind="stable")
+            batches = [order[start:start + self.batch_size] for start in range(0, len(texts), self.batch_size)]
+            del lengths, order
+
+            self._job_id += 1
+            job_id = self._job_id
+            errors = []
+            try:
+                # Deal batches round-robin so every worker gets a mix of short and long rows
+                for worker_id, jobs in enumerate(self._jobs):
+                    jobs.put((job_id, ids_shm.name, ids_shape, out_shm.name, out_shape,
+                              batches[worker_id::len(self._jobs)]))
+
+                pending = len(batches)
+                while pending:
+                    _, message_job_id, start, error = self._next_message()
+                    if message_job_id != job_id:
+                        # Left over from an earlier, interrupted call
+                        continue
+                    pending -= 1
+                    if error is not None:
+                        errors.append(f"batch containing row {start}: {error}")
+            except BaseException:
+                # Workers may still be running this job against buffers about to be unlinked
+                self._terminate()
+                raise
+            if errors:
+                raise RuntimeError("Sharded inference failed for " + "; ".join(errors))
+
+            scores = np.ndarray(out_shape, dtype=np.float32, buffer=out_shm.buf)
+            result = scores.astype(dtype)
+        finally:
+            token_ids = scores = None
+            ids_shm.close()
+            ids_shm.unlink()
+            out_shm.close()
+            out_shm.unlink()
+
+        return EmotionRecords(message_ids, result, self.labels)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure sharded inference throughput on a text corpus.")
+    parser.add_argument("corpus", help="Text file with one message per line")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Hugging Face model name")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1],
+                        help="Worker counts to benchmark")
+    parser.add_argument("--threads-per-worker", type=int, default=None, help="Torch threads per worker")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--max-length", type=int, default=128)
+    parser.add_argument("--limit", type=int, default=None, help="Only use the first N messages")
+    args = parser.parse_args(argv)
+
+    with open(args.corpus, encoding="utf-8") as f:
+        texts = [line.strip() for line in f if line.strip()]
+    texts = texts[:args.limit]
+
+    baseline = None
+    for num_workers in args.workers:
+        with ShardedClassifier(args.model, num_workers=num_workers, threads_per_worker=args.threads_per_worker,
+                               batch_size=args.batch_size, max_length=args.max_length) as classifier:
+            # Warm up every worker before timing
+            classifier.score(texts[:args.batch_size * num_workers])
+            started = time.perf_counter()
+            classifier.score(texts)
+            elapsed = time.perf_counter() - started
+        throughput = len(texts) / elapsed
+        baseline = baseline or throughput
+        print(f"{num_workers:>3} workers x {classifier.threads_per_worker} threads: "
+              f"{throughput:,.1f} messages/s ({throughput / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
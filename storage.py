@@ -0,0 +1,213 @@
+"""Persistent team workspaces backed by an embedded SQLite database.
+
+Each "Generate Insights" click is stored as a row in ``runs``; the per-source
+``insights`` and dashboard ``aggregates`` of that run hang off its id.
+Uploaded ``documents`` are deduplicated per team by content hash, so teams
+re-uploading the same report do not grow the database. Everything is indexed
+on team, source and date so the dashboard can reopen a workspace with a
+handful of indexed lookups instead of re-running the models.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime, timezone
+
+import pandas as pd
+
+DEFAULT_DB_PATH = os.environ.get("INSIGHT_DB_PATH", "workspaces.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    team TEXT NOT NULL,
+    source TEXT NOT NULL,
+    name TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    content BLOB,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    team TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS insights (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    document_id INTEGER NOT NULL REFERENCES documents(id),
+    source TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS aggregates (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value TEXT NOT NULL
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_documents_team_sha256
+    ON documents (team, sha256);
+CREATE INDEX IF NOT EXISTS idx_documents_team_source_date
+    ON documents (team, source, created_at);
+CREATE INDEX IF NOT EXISTS idx_runs_team
+    ON runs (team, id);
+CREATE INDEX IF NOT EXISTS idx_runs_team_date
+    ON runs (team, created_at);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_insights_run_source
+    ON insights (run_id, source);
+CREATE INDEX IF NOT EXISTS idx_insights_document
+    ON insights (document_id);
+CREATE INDEX IF NOT EXISTS idx_aggregates_run
+    ON aggregates (run_id);
+"""
+
+
+def connect(path=DEFAULT_DB_PATH):
+    """Open (and if needed create) the workspace database.
+
+    Transactions are scoped to a connection, so callers running concurrently
+    (Streamlit sessions, export processes) should each open their own.
+    """
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec="microseconds")
+
+
+def _encode(value):
+    """Make insight payloads JSON friendly, keeping DataFrames round-trippable."""
+    if isinstance(value, pd.DataFrame):
+        return {"__frame__": value.to_dict(orient="split")}
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    return value
+
+
+def _decode(value):
+    if isinstance(value, dict):
+        if "__frame__" in value:
+            frame = value["__frame__"]
+            return pd.DataFrame(frame["data"], index=frame["index"], columns=frame["columns"])
+        return {key: _decode(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    return value
+
+
+def _document_hash(name, content):
+    # Demo inputs carry no bytes, so they are identified by name instead
+    data = content if content is not None else f"name:{name}".encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def _store_document(conn, team, source, name, content, created_at):
+    """Insert a document unless the team already has one with the same content; return its id."""
+    sha256 = _document_hash(name, content)
+    conn.execute(
+        "INSERT OR IGNORE INTO documents (team, source, name, sha256, content, created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (team, source, name, sha256, content, created_at),
+    )
+    return conn.execute(
+        "SELECT id FROM documents WHERE team = ? AND sha256 = ?", (team, sha256)
+    ).fetchone()[0]
+
+
+def save_workspace(conn, team, documents, results, aggregates):
+    """Store one analysis run for ``team`` and return its run id.
+
+    ``documents`` maps each source (``"audio"``, ``"text"``, ``"pdf"``) to a
+    ``(name, content)`` tuple, ``results`` maps the same sources to their
+    insight dicts and ``aggregates`` is a list of dashboard level metrics.
+    """
+    created_at = _now()
+    with conn:
+        run_id = conn.execute(
+            "INSERT INTO runs (team, created_at) VALUES (?, ?)", (team, created_at)
+        ).lastrowid
+        for source, insights in results.items():
+            name, content = documents.get(source, (f"{source}-input", None))
+            document_id = _store_document(conn, team, source, name, content, created_at)
+            conn.execute(
+                "INSERT INTO insights (run_id, document_id, source, payload) VALUES (?, ?, ?, ?)",
+                (run_id, document_id, source, json.dumps(_encode(insights))),
+            )
+        conn.executemany(
+            "INSERT INTO aggregates (run_id, name, value) VALUES (?, ?, ?)",
+            [(run_id, item["name"], json.dumps(item)) for item in aggregates],
+        )
+    return run_id
+
+
+def latest_run(conn, team):
+    """Return ``(run_id, created_at)`` of the team's most recent run, or ``None``."""
+    return conn.execute(
+        "SELECT id, created_at FROM runs WHERE team = ? ORDER BY id DESC LIMIT 1", (team,)
+    ).fetchone()
+
+
+def _run_insights(conn, run_id, sources):
+    rows = conn.execute("SELECT source, payload FROM insights WHERE run_id = ?", (run_id,)).fetchall()
+    return {source: _decode(json.loads(payload)) for source, payload in rows if source in sources}
+
+
+def _run_aggregates(conn, run_id):
+    rows = conn.execute("SELECT value FROM aggregates WHERE run_id = ? ORDER BY id", (run_id,)).fetchall()
+    return [json.loads(row[0]) for row in rows]
+
+
+def load_insights(conn, team, sources=("audio", "text", "pdf")):
+    """Return the insights of the team's latest run, or ``None`` if the team has none."""
+    run = latest_run(conn, team)
+    if run is None:
+        return None
+    return _run_insights(conn, run[0], sources) or None
+
+
+def load_aggregates(conn, team):
+    """Return the dashboard metrics from the team's most recent run."""
+    run = latest_run(conn, team)
+    return [] if run is None else _run_aggregates(conn, run[0])
+
+
+def load_workspace(conn, team, sources=("audio", "text", "pdf")):
+    """Return ``(results, aggregates, created_at)`` of the team's latest run, or ``None``.
+
+    Everything is read inside one transaction, so the run, its insights and
+    its aggregates always belong together.
+    """
+    conn.execute("BEGIN")
+    try:
+        run = latest_run(conn, team)
+        if run is None:
+            return None
+        run_id, created_at = run
+        return _run_insights(conn, run_id, sources), _run_aggregates(conn, run_id), created_at
+    finally:
+        conn.commit()
+
+
+def list_documents(conn, team, source=None):
+    """List ingested documents for a team, newest first."""
+    query = "SELECT id, source, name, created_at FROM documents WHERE team = ?"
+    params = [team]
+    if source is not None:
+        query += " AND source = ?"
+        params.append(source)
+    query += " ORDER BY created_at DESC"
+    return pd.read_sql_query(query, conn, params=params)
+
+
+def list_teams(conn):
+    return [row[0] for row in conn.execute("SELECT DISTINCT team FROM runs ORDER BY team")]
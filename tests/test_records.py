@@ -0,0 +1,102 @@
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from records import GO_EMOTIONS_LABELS, EmotionRecords, MessageMeta, score_messages
+
+
+def column(label):
+    return GO_EMOTIONS_LABELS.index(label)
+
+
+def test_fill_maps_labels_to_columns():
+    records = EmotionRecords.from_pipeline_output(
+        [
+            [{"label": "joy", "score": 0.75}, {"label": "neutral", "score": 0.25}],
+            [{"label": "anger", "score": 0.5}],
+        ],
+        message_ids=[10, 20],
+    )
+
+    assert records.scores[0, column("joy")] == 0.75
+    assert records.scores[0, column("neutral")] == 0.25
+    assert records.scores[1, column("anger")] == 0.5
+    assert records.scores.sum() == pytest.approx(1.5)
+    np.testing.assert_array_equal(records.row(20), records.scores[1])
+
+
+def test_unknown_label_raises():
+    with pytest.raises(ValueError, match="determination"):
+        EmotionRecords.from_pipeline_output([[{"label": "determination", "score": 0.4}]])
+
+
+def test_float16_storage_with_float32_means():
+    records = EmotionRecords.from_pipeline_output(
+        [[{"label": "optimism", "score": 0.62}], [{"label": "optimism", "score": 0.12}]]
+    )
+
+    assert records.scores.dtype == np.float16
+    means = records.mean_scores()
+    assert means.dtype == np.float32
+    assert means[column("optimism")] == pytest.approx(0.37, abs=1e-3)
+    assert records.primary_emotion() == "optimism"
+
+    top = records.top_emotions(k=2)
+    assert top.columns.tolist() == ["label", "score"]
+    assert top["label"].iloc[0] == "optimism"
+
+
+def test_dominant_labels_and_counts():
+    records = EmotionRecords.from_pipeline_output([
+        [{"label": "joy", "score": 0.9}, {"label": "fear", "score": 0.1}],
+        [{"label": "fear", "score": 0.8}],
+        [{"label": "joy", "score": 0.6}],
+    ])
+
+    assert records.dominant_codes().dtype == np.uint8
+    assert list(records.dominant_labels()) == ["joy", "fear", "joy"]
+    counts = records.label_counts()
+    assert counts["joy"] == 2
+    assert counts["fear"] == 1
+    assert counts.sum() == 3
+
+
+def test_mask_matches_metadata():
+    meta = [
+        MessageMeta(1, team="sales", source="text", speaker="Sarah"),
+        MessageMeta(2, team="sales", source="audio", speaker="John"),
+        MessageMeta(3, team="ops", source="text", speaker=None),
+    ]
+    records = EmotionRecords([1, 2, 3], np.zeros((3, len(GO_EMOTIONS_LABELS)), dtype=np.float16), meta=meta)
+
+    np.testing.assert_array_equal(records.mask(team="sales"), [True, True, False])
+    np.testing.assert_array_equal(records.mask(team="sales", source="text"), [True, False, False])
+    np.testing.assert_array_equal(records.mask(speaker=None), [False, False, True])
+    np.testing.assert_array_equal(records.mask(team="finance"), [False, False, False])
+    with pytest.raises(ValueError):
+        records.mask(timestamp="2024-01-01")
+
+
+def test_meta_length_must_match_rows():
+    with pytest.raises(ValueError, match="meta"):
+        EmotionRecords([1, 2], np.zeros((2, len(GO_EMOTIONS_LABELS))), meta=[MessageMeta(1)])
+
+
+def test_score_messages_batches_classifier_calls():
+    calls = []
+
+    def classifier(batch, batch_size, truncation):
+        calls.append(list(batch))
+        return [[{"label": "joy", "score": int(text) / 10}] for text in batch]
+
+    records = score_messages(classifier, [str(n) for n in range(5)], message_ids=[5, 6, 7, 8, 9], batch_size=2)
+
+    assert calls == [["0", "1"], ["2", "3"], ["4"]]
+    np.testing.assert_array_equal(records.message_ids, [5, 6, 7, 8, 9])
+    np.testing.assert_allclose(records.scores[:, column("joy")], [0.0, 0.1, 0.2, 0.3, 0.4], atol=1e-3)
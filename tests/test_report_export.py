@@ -0,0 +1,112 @@
+import json
+import os
+import sys
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("plotly")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import report_export
+import storage
+from plotly.offline import get_plotlyjs_version
+
+HEALTH_KPIS = [
+    {"name": "Revenue Growth", "value": "+15%", "delta": "▲ 2% from last quarter", "color": "#00c853"},
+    {"name": "Risk Level", "value": "Medium", "delta": "Supply chain delays", "color": None},
+]
+
+FRAME_FILES = [
+    "health_kpis", "speakers", "emotions", "topics", "key_phrases",
+    "financials", "financial_kpis", "recommendations",
+]
+
+
+def make_results(topic="Product Growth"):
+    return {
+        "audio": {
+            "emotions": pd.DataFrame([{"label": "optimism", "score": 0.45}, {"label": "neutral", "score": 0.15}]),
+            "primary_emotion": "optimism",
+            "speakers": [{"name": "Sarah (CEO)", "time": 60}, {"name": "Others", "time": 40}],
+            "sentiment": "Mixed",
+        },
+        "text": {
+            "sentiment": "Positive",
+            "topics": pd.DataFrame([{"topic": topic, "importance": 95}]),
+            "key_phrases": ["Strong growth in AI products"],
+        },
+        "pdf": {
+            "extracted_text": "Quarterly report",
+            "trends": ["Growth"],
+            "chart_data": pd.DataFrame({"Month": ["Jan 2023", "Feb 2023"], "Revenue": [120, 135], "Profit": [45, 50]}),
+            "kpis": [{"name": "Profit Margin", "value": "24.5%", "change": "+1.2% YoY"}],
+        },
+    }
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "workspaces.db")
+    conn = storage.connect(path)
+    storage.save_workspace(conn, "sales team", {}, make_results(), HEALTH_KPIS)
+    storage.save_workspace(conn, "sales/team", {}, make_results(), HEALTH_KPIS)
+    conn.close()
+    return path
+
+
+def test_team_slug_keeps_colliding_names_apart():
+    slugs = {report_export.team_slug(team) for team in ("sales team", "sales/team", "sales_team")}
+    assert len(slugs) == 3
+    assert all(slug.startswith("sales_team-") for slug in slugs)
+
+
+def test_render_html_escapes_script_in_chart_text():
+    page = report_export.render_html("sales", make_results(topic="</script><script>alert(1)"), HEALTH_KPIS)
+
+    # The topic still reaches the chart data, just never as a raw closing tag
+    assert "</script><script>alert(1)" not in page
+    assert "alert(1)" in page.split('id="chart-1-data">', 1)[1].split("</script>", 1)[0]
+
+
+def test_render_html_uses_installed_plotlyjs_version():
+    page = report_export.render_html("sales", make_results(), HEALTH_KPIS)
+    assert f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js" in page
+
+
+def test_export_reports_writes_separate_directories_and_exact_manifests(db_path, tmp_path):
+    out_dir = str(tmp_path / "reports")
+    exported = report_export.export_reports(out_dir, db_path=db_path, workers=2, formats=("csv",))
+
+    assert set(exported) == {"sales team", "sales/team"}
+    assert exported["sales team"] != exported["sales/team"]
+
+    expected = sorted(["report.html"] + [f"{name}.csv" for name in FRAME_FILES])
+    for team, report_dir in exported.items():
+        with open(os.path.join(report_dir, "manifest.json"), encoding="utf-8") as f:
+            manifest = json.load(f)
+        assert manifest["team"] == team
+        assert manifest["files"] == expected
+        assert sorted(os.listdir(report_dir)) == sorted(expected + ["manifest.json"])
+
+
+def test_manifest_ignores_leftover_files(db_path, tmp_path):
+    out_dir = str(tmp_path / "reports")
+    report_dir = report_export.export_team_report("sales team", out_dir, db_path, formats=("csv",))
+    open(os.path.join(report_dir, "stale.parquet"), "w").close()
+
+    report_export.export_team_report("sales team", out_dir, db_path, formats=("csv",))
+    with open(os.path.join(report_dir, "manifest.json"), encoding="utf-8") as f:
+        assert "stale.parquet" not in json.load(f)["files"]
+
+
+def test_unknown_team_is_skipped(db_path, tmp_path):
+    assert report_export.export_team_report("finance", str(tmp_path / "reports"), db_path) is None
+
+
+def test_unknown_formats_are_rejected(db_path, tmp_path):
+    with pytest.raises(ValueError, match="xlsx"):
+        report_export.export_reports(str(tmp_path / "reports"), db_path=db_path, formats=("csv", "xlsx"))
+    with pytest.raises(SystemExit):
+        report_export.main(["--out", str(tmp_path / "reports"), "--db", db_path, "--formats", "csv,xlsx"])
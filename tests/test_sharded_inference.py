@@ -0,0 +1,133 @@
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sharded_inference import ShardedClassifier
+
+LABELS = ("first_token", "length")
+
+
+class StubTokenizer:
+    """Encodes text ``"<n>"`` as ``1 + n % 7`` copies of token ``n + 1``."""
+
+    pad_token_id = 0
+
+    def __call__(self, texts, padding=False, truncation=True, max_length=None):
+        input_ids = []
+        for text in texts:
+            n = int(text)
+            input_ids.append([n + 1] * (1 + n % 7))
+        return {"input_ids": input_ids}
+
+
+def echo_loader(model_name, threads):
+    def predict(token_ids, mask):
+        return np.stack([token_ids[:, 0], mask.sum(axis=1)], axis=1).astype(np.float32)
+    return predict
+
+
+def failing_batch_loader(model_name, threads):
+    def predict(token_ids, mask):
+        if (token_ids == 5).any():
+            raise ValueError("bad batch")
+        return np.zeros((len(token_ids), len(LABELS)), dtype=np.float32)
+    return predict
+
+
+def crashing_loader(model_name, threads):
+    def predict(token_ids, mask):
+        os._exit(3)
+    return predict
+
+
+def broken_loader(model_name, threads):
+    raise OSError("model not found")
+
+
+def make_classifier(loader, **kwargs):
+    return ShardedClassifier(
+        model_name="stub",
+        num_workers=2,
+        threads_per_worker=1,
+        batch_size=4,
+        max_length=8,
+        tokenizer=StubTokenizer(),
+        labels=LABELS,
+        model_loader=loader,
+        **kwargs,
+    )
+
+
+def test_scores_come_back_in_input_order():
+    texts = [str(n) for n in range(37)]
+    with make_classifier(echo_loader, tokenize_chunk_size=5) as classifier:
+        records = classifier.score(texts, dtype=np.float32)
+
+    assert records.labels == LABELS
+    np.testing.assert_array_equal(records.message_ids, np.arange(37))
+    np.testing.assert_array_equal(records.scores[:, 0], np.arange(37) + 1)
+    np.testing.assert_array_equal(records.scores[:, 1], 1 + np.arange(37) % 7)
+
+
+def test_empty_input():
+    with make_classifier(echo_loader) as classifier:
+        records = classifier.score([])
+    assert len(records) == 0
+    assert records.scores.shape == (0, len(LABELS))
+
+
+def test_batch_errors_are_raised():
+    with make_classifier(failing_batch_loader) as classifier:
+        with pytest.raises(RuntimeError, match="bad batch"):
+            classifier.score([str(n) for n in range(10)])
+        # Workers survive a failed batch and keep serving jobs
+        assert len(classifier.score(["1", "2"])) == 2
+
+
+def test_worker_death_does_not_hang():
+    with make_classifier(crashing_loader) as classifier:
+        with pytest.raises(RuntimeError, match="died"):
+            classifier.score([str(n) for n in range(10)])
+
+
+def test_model_load_failure_fails_start():
+    with pytest.raises(RuntimeError, match="model not found"):
+        make_classifier(broken_loader).start()
+
+
+def test_score_requires_start():
+    with pytest.raises(RuntimeError, match="not running"):
+        make_classifier(echo_loader).score(["1"])
+
+
+def test_messages_from_other_jobs_are_ignored():
+    texts = [str(n) for n in range(12)]
+    with make_classifier(echo_loader) as classifier:
+        # Stale results from an earlier, interrupted call must not count towards this one
+        for row in range(len(texts)):
+            classifier._done.put(("batch", -1, row, None))
+        records = classifier.score(texts, dtype=np.float32)
+
+    np.testing.assert_array_equal(records.scores[:, 0], np.arange(12) + 1)
+
+
+def test_interrupted_gather_terminates_workers():
+    classifier = make_classifier(echo_loader).start()
+    processes = list(classifier._processes)
+
+    def interrupt():
+        raise KeyboardInterrupt
+
+    classifier._next_message = interrupt
+    with pytest.raises(KeyboardInterrupt):
+        classifier.score([str(n) for n in range(10)])
+
+    assert not any(process.is_alive() for process in processes)
+    with pytest.raises(RuntimeError, match="not running"):
+        classifier.score(["1"])
@@ -0,0 +1,92 @@
+import os
+import sys
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import storage
+
+
+def make_results(revenue=120, sentiment="Positive"):
+    return {
+        "audio": {
+            "emotions": pd.DataFrame([{"label": "optimism", "score": 0.45}, {"label": "neutral", "score": 0.15}]),
+            "speakers": [{"name": "Sarah (CEO)", "time": "32%"}],
+        },
+        "text": {"sentiment": sentiment, "key_phrases": ["Strong growth"]},
+        "pdf": {"chart_data": pd.DataFrame({"Month": ["Jan 2023", "Feb 2023"], "Revenue": [revenue, 135]})},
+    }
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = storage.connect(str(tmp_path / "workspaces.db"))
+    yield conn
+    conn.close()
+
+
+def test_dataframes_round_trip(conn):
+    results = make_results()
+    storage.save_workspace(conn, "sales", {}, results, [])
+
+    loaded = storage.load_insights(conn, "sales")
+    pd.testing.assert_frame_equal(loaded["audio"]["emotions"], results["audio"]["emotions"])
+    pd.testing.assert_frame_equal(loaded["pdf"]["chart_data"], results["pdf"]["chart_data"])
+    assert loaded["audio"]["speakers"] == results["audio"]["speakers"]
+    assert loaded["text"] == results["text"]
+
+
+def test_loads_latest_run_only(conn):
+    storage.save_workspace(conn, "sales", {}, make_results(revenue=1, sentiment="Negative"), [{"name": "Risk", "value": "High"}])
+    latest = storage.save_workspace(conn, "sales", {}, make_results(revenue=2), [{"name": "Risk", "value": "Low"}])
+
+    assert storage.latest_run(conn, "sales")[0] == latest
+    loaded = storage.load_insights(conn, "sales")
+    assert loaded["text"]["sentiment"] == "Positive"
+    assert loaded["pdf"]["chart_data"]["Revenue"].tolist() == [2, 135]
+    assert storage.load_aggregates(conn, "sales") == [{"name": "Risk", "value": "Low"}]
+
+
+def test_teams_are_isolated(conn):
+    storage.save_workspace(conn, "sales", {}, make_results(sentiment="Positive"), [{"name": "Risk", "value": "Low"}])
+    storage.save_workspace(conn, "ops", {}, make_results(sentiment="Negative"), [{"name": "Risk", "value": "High"}])
+
+    assert storage.load_insights(conn, "sales")["text"]["sentiment"] == "Positive"
+    assert storage.load_insights(conn, "ops")["text"]["sentiment"] == "Negative"
+    assert storage.load_aggregates(conn, "ops") == [{"name": "Risk", "value": "High"}]
+    assert storage.load_insights(conn, "finance") is None
+    assert storage.load_aggregates(conn, "finance") == []
+    assert storage.list_teams(conn) == ["ops", "sales"]
+
+
+def test_documents_are_deduplicated_per_team(conn):
+    documents = {"pdf": ("q3.pdf", b"%PDF quarterly report")}
+    storage.save_workspace(conn, "sales", documents, make_results(), [])
+    storage.save_workspace(conn, "sales", {"pdf": ("q3-copy.pdf", b"%PDF quarterly report")}, make_results(), [])
+    storage.save_workspace(conn, "ops", documents, make_results(), [])
+
+    sales_pdfs = storage.list_documents(conn, "sales", source="pdf")
+    assert sales_pdfs["name"].tolist() == ["q3.pdf"]
+    assert len(storage.list_documents(conn, "ops", source="pdf")) == 1
+
+    document_ids = conn.execute(
+        "SELECT DISTINCT document_id FROM insights JOIN runs ON runs.id = insights.run_id "
+        "WHERE runs.team = 'sales' AND insights.source = 'pdf'"
+    ).fetchall()
+    assert len(document_ids) == 1
+
+
+def test_load_workspace_returns_one_run(conn):
+    assert storage.load_workspace(conn, "sales") is None
+
+    storage.save_workspace(conn, "sales", {}, make_results(revenue=1), [{"name": "Risk", "value": "High"}])
+    run_id = storage.save_workspace(conn, "sales", {}, make_results(revenue=2), [{"name": "Risk", "value": "Low"}])
+
+    results, aggregates, created_at = storage.load_workspace(conn, "sales")
+    assert results["pdf"]["chart_data"]["Revenue"].tolist() == [2, 135]
+    assert aggregates == [{"name": "Risk", "value": "Low"}]
+    assert created_at == storage.latest_run(conn, "sales")[1]
+    assert storage.latest_run(conn, "sales")[0] == run_id